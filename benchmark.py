@@ -0,0 +1,1113 @@
+#!/usr/bin/env python3
+"""
+Offline micro-benchmarks for the TechJobs360 scraper.
+
+Run all benchmarks:      python benchmark.py
+Run selected ones:       python benchmark.py dedup
+
+No network access or credentials are needed.
+"""
+
+import sys
+import time
+import random
+import hashlib
+import functools
+import argparse
+import io
+import json
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+import job_scraper
+from job_scraper import DedupIndex, classify_job, SENIORITY_KEYWORDS, ROLE_KEYWORDS
+
+
+def header(title):
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60)
+
+
+def timed(func, repeat=1):
+    """Return the best wall time in seconds of func() over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+# -------------------------
+# Dedup lookup
+# -------------------------
+def _fake_entries(n):
+    return [{"hash": hashlib.sha1(str(i).encode()).hexdigest(), "url": f"https://example.com/job/{i}",
+             "first_seen": 0} for i in range(n)]
+
+
+def bench_dedup():
+    header("DEDUP LOOKUP: linear scan vs DedupIndex")
+    print(f"{'entries':>10} {'linear/lookup':>15} {'index/lookup':>15} {'speedup':>10}")
+    for n in (10_000, 100_000, 1_000_000):
+        entries = _fake_entries(n)
+        index = DedupIndex(entries)
+        # half hits (spread over the list), half misses
+        probes = [entries[(i * 7919) % n]["hash"] for i in range(50)]
+        probes += [hashlib.sha1(f"miss-{i}".encode()).hexdigest() for i in range(50)]
+        linear_probes = probes[::10] if n >= 1_000_000 else probes
+
+        linear = timed(lambda: [any(d.get("hash") == h for d in entries) for h in linear_probes])
+        indexed = timed(lambda: [h in index for h in probes * 100], repeat=3)
+        per_linear = linear / len(linear_probes)
+        per_index = indexed / (len(probes) * 100)
+        print(f"{n:>10,} {per_linear * 1e6:>13.1f}us {per_index * 1e6:>13.3f}us {per_linear / per_index:>9.0f}x")
+
+
+# -------------------------
+# Classification
+# -------------------------
+def legacy_classify_job(title, description):
+    """classify_job as it was before the compiled matcher (one substring scan per keyword)."""
+    txt = (" ".join([title or "", description or ""])).lower()
+    seniority = "unspecified"
+    for level, kws in SENIORITY_KEYWORDS.items():
+        if any(k in txt for k in kws):
+            seniority = level
+            break
+    role = "other"
+    for r, kws in ROLE_KEYWORDS.items():
+        if any(k in txt for k in kws):
+            role = r
+            break
+    remote = "remote" if "remote" in txt or "work from home" in txt else "onsite"
+    skills = []
+    for r, kws in ROLE_KEYWORDS.items():
+        for k in kws:
+            if k in txt and k not in skills:
+                skills.append(k)
+    return {"seniority": seniority, "role": role, "work_type": remote, "skills": skills[:6]}
+
+
+FILLER = ("we are hiring a team player to join our growing company you will work closely with "
+          "product design and customer success to ship features build tools and improve reliability "
+          "benefits include health insurance equity flexible hours and a learning budget").split()
+KEYWORDS = sorted({k for kws in list(SENIORITY_KEYWORDS.values()) + list(ROLE_KEYWORDS.values()) for k in kws}
+                  | {"remote", "work from home"})
+
+
+def synthetic_jobs(n, seed=360, words=400):
+    """Deterministic (title, description) pairs: HTML-ish filler with keywords sprinkled in."""
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(n):
+        title = " ".join(rng.choice(KEYWORDS + FILLER).title() for _ in range(rng.randint(2, 5)))
+        body = []
+        for _ in range(rng.randint(words // 4, words)):
+            r = rng.random()
+            body.append(rng.choice(KEYWORDS) if r < 0.01 else rng.choice(["<li>", "</p>", "<strong>"]) if r < 0.1
+                        else rng.choice(FILLER))
+        jobs.append((title, " ".join(body)))
+    return jobs
+
+
+def bench_classify():
+    header("CLASSIFY: per-keyword substring scans vs compiled matcher")
+    backend = "aho-corasick" if job_scraper._CLASSIFY_MATCHER.automaton is not None else "substring fallback"
+    print(f"Matcher backend: {backend}")
+    ok = True
+    for n, words in ((5000, 400), (1000, 4000)):
+        jobs = synthetic_jobs(n, words=words)
+        mismatches = [j for j in jobs if legacy_classify_job(*j) != classify_job(*j)]
+        ok = ok and not mismatches
+        legacy = timed(lambda: [legacy_classify_job(t, d) for t, d in jobs], repeat=3)
+        compiled = timed(lambda: [classify_job(t, d) for t, d in jobs], repeat=3)
+        avg_kb = sum(len(d) for _, d in jobs) / len(jobs) / 1024
+        print(f"\n{n} jobs, ~{avg_kb:.1f} KB description each "
+              f"(golden check: {n - len(mismatches)}/{n} identical)")
+        print(f"  legacy:   {legacy * 1e3:8.1f} ms ({legacy / n * 1e6:.1f} us/job)")
+        print(f"  compiled: {compiled * 1e3:8.1f} ms ({compiled / n * 1e6:.1f} us/job)")
+        print(f"  speedup:  {legacy / compiled:.2f}x")
+    return ok
+
+
+# -------------------------
+# Streaming feeds
+# -------------------------
+BOARD_NEWEST = 1_760_000_000  # posting time of the newest synthetic board item; one item per 10 minutes before it
+
+
+def _remoteok_board(n, desc_kb=6):
+    rng = random.Random(360)
+    items = [{"legal": "API terms of service"}]
+    for i in range(1, n + 1):
+        role = rng.choice(["python", "golang", "react", "devops", "data"])
+        items.append({"id": str(i), "epoch": BOARD_NEWEST - 600 * (i - 1),
+                      "position": f"Senior {role} engineer", "company": f"Company {i % 500}",
+                      "tags": [role, "remote"], "location": "Worldwide", "url": f"https://remoteok.com/remote-jobs/{i}",
+                      "description": "<p>" + " ".join(rng.choice(FILLER) for _ in range(desc_kb * 150)) + "</p>"})
+    return json.dumps(items).encode()
+
+
+def _fake_response(body):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.encoding = "utf-8"
+    resp.raw = io.BytesIO(body)
+    return resp
+
+
+def legacy_query_remoteok(body, query, limit):
+    """RemoteOK as it was before streaming: resp.json() on the whole board, then filter."""
+    data = _fake_response(body).json()
+    items = []
+    for item in data:
+        if not item.get("id"):
+            continue
+        title = item.get("position") or item.get("title") or ""
+        combined = f"{title} {item.get('company') or ''} {' '.join(item.get('tags') or [])}".lower()
+        items.append((combined, {"id": item.get("id"), "title": title, "description": item.get("description"),
+                                 "raw": item}))
+    return items, [job for combined, job in items if query in combined][:limit]
+
+
+def _peak_memory(func):
+    """Return (peak traced bytes, wall seconds); timed separately since tracing slows allocation."""
+    tracemalloc.start()
+    kept = func()  # keep the result alive, as the per-run feed cache does
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del kept
+    return peak, timed(func, repeat=3)
+
+
+def bench_feeds():
+    header("FEEDS: resp.json() on the whole board vs streaming parse")
+    body = _remoteok_board(3000)
+    print(f"Synthetic RemoteOK board: 3000 jobs, {len(body) / 2**20:.1f} MB")
+    original = job_scraper.http_request
+    job_scraper.http_request = lambda method, url, **kwargs: _fake_response(body)
+    try:
+        for label, query in (("query with early matches", "python"), ("query matching nothing", "cobol")):
+            def streamed():
+                job_scraper.FEED_CACHE.clear()
+                return job_scraper.query_remoteok(query, 80)
+
+            legacy_peak, legacy_time = _peak_memory(lambda: legacy_query_remoteok(body, query, 80))
+            stream_peak, stream_time = _peak_memory(streamed)
+            parsed = job_scraper.FEED_CACHE._feeds["remoteok"].parsed
+            print(f"\n{label} ({parsed} of 3000 items parsed when streaming)")
+            print(f"  resp.json(): peak {legacy_peak / 2**20:7.1f} MB, {legacy_time * 1e3:7.1f} ms")
+            print(f"  streaming:   peak {stream_peak / 2**20:7.1f} MB, {stream_time * 1e3:7.1f} ms")
+        job_scraper.FEED_CACHE.clear()
+    finally:
+        job_scraper.http_request = original
+    return _feed_idle_drop(body)
+
+
+def _feed_idle_drop(body):
+    """A host that drops a connection left unread for 0.5 s (as real servers drop idle sockets)."""
+    import socket
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.connection.settimeout(0.5)
+            try:
+                self.wfile.write(body)
+            except (socket.timeout, OSError):
+                self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    original = job_scraper.http_request
+    job_scraper.http_request = lambda method, url, **kwargs: original(
+        method, f"http://127.0.0.1:{server.server_port}/api", **kwargs)
+    try:
+        job_scraper.FEED_CACHE.clear()
+        job_scraper.query_remoteok("python", 80)
+        time.sleep(1.5)  # the other locales of the continent, other sources
+        late = job_scraper.query_remoteok("cobol", 80)
+        feed = job_scraper.FEED_CACHE._feeds.get("remoteok")
+        ok = late == [] and feed is not None and feed.exhausted and not feed.failed and feed.parsed == 3000
+        job_scraper.FEED_CACHE.clear()
+    finally:
+        job_scraper.http_request = original
+        server.shutdown()
+    print(f"\n  [{'ok' if ok else 'FAIL'}] feed left half-read while its host drops idle connections "
+          f"is still read to the end ({feed.parsed if feed else 0} of 3000 items)")
+    return ok
+
+
+# -------------------------
+# HTML parsing
+# -------------------------
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "html"
+
+HTML_SOURCES = {
+    "weworkremotely": lambda: job_scraper.parse_weworkremotely("python", limit=30),
+    "indeed": lambda: job_scraper.parse_indeed("python", "Berlin", limit=20),
+    "linkedin": lambda: job_scraper.parse_linkedin("python", "Berlin", limit=15),
+    "generic": lambda: job_scraper.run_source(job_scraper.SourceRequest(
+        job_scraper.SOURCES["html"], {"type": "html", "endpoint": "https://example.com/jobs?q={query}"},
+        "python", "python Berlin", "Berlin", None, {})),
+}
+
+
+def bench_html():
+    header("HTML: full html.parser tree vs make_soup backends")
+    parsers = ["html.parser"] + (["lxml"] if job_scraper.HTML_PARSER == "lxml" else [])
+    if len(parsers) == 1:
+        print("lxml is not installed; only html.parser is measured")
+    original_request, original_soup = job_scraper.http_request, job_scraper.make_soup
+    ok = True
+    try:
+        for name, parse in HTML_SOURCES.items():
+            page = (FIXTURES_DIR / f"{name}.html").read_bytes()
+            job_scraper.http_request = lambda method, url, **kwargs: _fake_response(page)
+
+            # the pre-backend code path: full tree, html.parser
+            job_scraper.make_soup = lambda markup, parse_only=None, parser=None: BeautifulSoup(markup, "html.parser")
+            golden = parse()
+            baseline = timed(parse, repeat=5)
+            print(f"\n{name}.html ({len(page) / 1024:.0f} KB, {len(golden)} jobs)")
+            print(f"  {'html.parser, full tree':<28} {baseline * 1e3:7.1f} ms")
+            for parser in parsers:
+                for strained in (False, True):
+                    if parser == "html.parser" and not strained:
+                        continue  # that is the baseline
+                    def soup(markup, parse_only=None, parser=parser, strained=strained):
+                        return original_soup(markup, parse_only if strained else None, parser)
+                    job_scraper.make_soup = soup
+                    same = parse() == golden
+                    ok = ok and same
+                    elapsed = timed(parse, repeat=5)
+                    label = f"{parser}, {'job list only' if strained else 'full tree'}"
+                    print(f"  {label:<28} {elapsed * 1e3:7.1f} ms  {baseline / elapsed:5.1f}x"
+                          f"{'' if same else '  RESULTS DIFFER'}")
+    finally:
+        job_scraper.http_request, job_scraper.make_soup = original_request, original_soup
+    return ok
+
+
+# -------------------------
+# Job records
+# -------------------------
+def _upstream_items(n):
+    """RemoteOK-shaped API items, as JSON text so each run parses fresh objects."""
+    rng = random.Random(21)
+    items = []
+    for i in range(n):
+        role = rng.choice(["python", "golang", "react", "devops", "data"])
+        items.append({
+            "slug": f"remote-senior-{role}-engineer-company-{i}", "id": str(100000 + i), "epoch": 1_760_000_000 - i,
+            "date": "2025-10-09T09:20:00+00:00", "company": f"Company {i % 500}", "position": f"Senior {role} engineer",
+            "company_logo": f"https://remoteok.com/assets/img/jobs/{i}.png", "logo": f"https://remoteok.com/assets/img/jobs/{i}.png",
+            "tags": [role, "remote", "senior", "backend", "engineer"], "location": "Worldwide",
+            "salary_min": 90000 + i % 50 * 1000, "salary_max": 150000, "verified": True, "original": True,
+            "apply_url": f"https://remoteok.com/remote-jobs/{i}/apply", "url": f"https://remoteok.com/remote-jobs/{i}",
+            "description": "<p>" + " ".join(rng.choice(FILLER) for _ in range(500)) + "</p>",
+        })
+    return json.dumps(items)
+
+
+def _dict_jobs(items):
+    """Candidates as sources built them before Job: a dict per job holding the whole item under raw."""
+    return [{"id": item.get("id"), "title": item.get("position"), "company": item.get("company"),
+             "location": item.get("location") or "", "description": item.get("description") or "",
+             "url": item.get("url"), "posted_at": job_scraper.parse_posted_at(item.get("epoch")), "raw": item}
+            for item in items]
+
+
+def _slotted_jobs(items):
+    return [job_scraper.Job(id=item.get("id"), title=item.get("position"), company=item.get("company"),
+                            location=item.get("location") or "", description=item.get("description") or "",
+                            url=item.get("url"), source="remoteok",
+                            posted_at=job_scraper.parse_posted_at(item.get("epoch")), raw=item)
+            for item in items]
+
+
+def _retained(build, body):
+    """Bytes still allocated once build(parsed items) returns and the parsed items are dropped."""
+    tracemalloc.start()
+    jobs = build(json.loads(body))
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained, jobs
+
+
+def bench_job_records():
+    header("JOB RECORDS: dicts carrying raw vs slotted Job records")
+    n = 10_000
+    body = _upstream_items(n)
+    print(f"{n} RemoteOK-shaped items, {len(body) / 2**20:.1f} MB of JSON")
+    text = sum(len(item["description"]) for item in json.loads(body))
+    rows = {}
+    for label, build, copy in (("dict + raw", _dict_jobs, dict), ("Job", _slotted_jobs, job_scraper.Job.copy)):
+        retained, jobs = _retained(build, body)
+        tracemalloc.start()
+        copies = [copy(job) for job in jobs]  # each locale's candidate_jobs holds its own copies
+        per_copy = tracemalloc.get_traced_memory()[0] / n
+        tracemalloc.stop()
+        del copies
+        seconds = timed(lambda: build(json.loads(body)), repeat=3)
+        rows[label] = retained
+        print(f"  {label:<10}: {retained / 2**20:6.1f} MB per 10k candidates "
+              f"({(retained - text) / n:5.0f} B/job besides the description), "
+              f"{per_copy:4.0f} B per locale copy, built in {seconds * 1000:5.0f} ms")
+    same = (_slotted_jobs(json.loads(body)[:50])[7].raw == json.loads(body)[7])
+    print(f"  Job uses {rows['Job'] / rows['dict + raw']:.0%} of the memory; raw payload round-trips: {same}")
+    return same
+
+
+# -------------------------
+# Streaming pipeline
+# -------------------------
+def _simulated_locales(n_locales=30, per_call=100, seed=22):
+    """Planned requests for n_locales x 6 sources whose fetches sleep like real APIs (one slow source)."""
+    rng = random.Random(seed)
+    description = " ".join(rng.choice(FILLER) for _ in range(150))
+
+    def fetch(req):
+        time.sleep(req.src["latency"])
+        return [job_scraper.Job(id=f"{req.src['type']}-{req.text}-{i}", title=f"{req.text} {i}", company="Co",
+                                description=description + str(i), source=req.src["type"])
+                for i in range(per_call)]
+
+    planned = []
+    for i in range(n_locales):
+        reqs = []
+        for s in range(6):
+            spec = job_scraper.SourceSpec(f"sim{s}", fetch, host=f"sim{s}.example")
+            src = {"type": f"sim{s}", "latency": 0.4 if s == 0 else rng.uniform(0.005, 0.05)}
+            reqs.append(job_scraper.SourceRequest(spec, src, f"query {i}", f"query {i}", None, None, {}))
+        planned.append(reqs)
+    return planned
+
+
+def _collect_per_locale(planned, pool, consume):
+    """The loop before streaming: submit everything, then per locale in order wait for all its sources."""
+    pending = [[pool.submit(job_scraper.run_source, req) for req in reqs] for reqs in planned]
+    for futures in pending:
+        candidates = []
+        for fut in futures:
+            candidates += [job.copy() for job in fut.result()]
+        consume(candidates)
+
+
+def _stream_calls(planned, pool, consume):
+    planner = job_scraper.RequestPlanner(pool)
+    for _, asked, jobs in planner.stream(planned, window=16):
+        for _ in asked:
+            consume([job.copy() for job in jobs])
+
+
+def bench_streaming():
+    header("STREAMING: collect a locale's sources, then process vs stream each call on")
+    print("30 locales x 6 sources, 100 jobs per call; one source takes 0.4 s, the rest 5-50 ms; 8 workers")
+    from concurrent.futures import ThreadPoolExecutor
+    for label, run in (("collect per locale", _collect_per_locale), ("stream calls", _stream_calls)):
+        planned = _simulated_locales()
+        first = []
+        consumed = [0]
+
+        def consume(jobs):
+            if jobs and not first:
+                first.append(time.perf_counter())
+            consumed[0] += len(jobs)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            run(planned, pool, consume)
+        total = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {label:<19}: first job after {(first[0] - started) * 1000:6.0f} ms, all {consumed[0]} "
+              f"after {total:5.2f} s, peak {peak / 2**20:5.1f} MB")
+    return True
+
+
+# -------------------------
+# In-run seen set
+# -------------------------
+class _SimulatedPosting:
+    """Posts synchronously; a fixed share of jobs fail, as when WordPress rejects them."""
+
+    def __init__(self, dedup, fail_every=5):
+        self.dedup = dedup
+        self.fail_every = fail_every
+        self.attempts = 0
+
+    def is_pending(self, jhash):
+        return False
+
+    def post(self, jhash, job):
+        self.attempts += 1
+        if int(jhash, 16) % self.fail_every:
+            self.dedup.add({"hash": jhash, "title": job.get("title"), "company": job.get("company"),
+                            "location": job.get("location"), "url": job.get("url"), "first_seen": 0})
+
+
+def _legacy_filter(dedup, posting, fuzzy, jobs, counts):
+    """CandidateFilter.filter before the seen set: dedup store, this batch, and in-flight posts only."""
+    batch = set()
+    for job in jobs:
+        jhash = hashlib.sha1(str(job.get("id")).encode("utf-8")).hexdigest()
+        if jhash in dedup or jhash in batch or posting.is_pending(jhash):
+            continue
+        if fuzzy:
+            counts["fingerprints"] += 1
+            fp = job_scraper.fingerprint_job(job)
+            if dedup.find_near_duplicate(fp):
+                continue
+            dedup.reserve(fp)
+        batch.add(jhash)
+        yield jhash, job
+
+
+def bench_seen_set():
+    header("SEEN SET: repeat candidates across calls, with 1 in 5 posts failing")
+    rng = random.Random(23)
+    pool = [job_scraper.Job(id=f"job-{i}", title=f"{rng.choice(ROLES)} {i}", company=f"Company {i % 90}",
+                            location="Remote", url=f"https://board.example/jobs/{i}",
+                            description=" ".join(rng.choice(FILLER) for _ in range(200)))
+            for i in range(600)]
+    calls = [rng.sample(pool, 100) for _ in range(40)]  # remote boards answer many locales with the same jobs
+    print("40 source calls x 100 candidates drawn from 600 distinct jobs")
+    for fuzzy in (True, False):
+        print(f"\nfuzzy matching {'on' if fuzzy else 'off'}")
+        for label in ("before (dedup/pending only)", "in-run seen set"):
+            dedup = DedupIndex([])
+            posting = _SimulatedPosting(dedup)
+            counts = {"fingerprints": 0}
+            candidates = job_scraper.CandidateFilter(dedup, posting, fuzzy)
+            started = time.perf_counter()
+            for jobs in calls:
+                if label.startswith("before"):
+                    fresh = list(_legacy_filter(dedup, posting, fuzzy, jobs, counts))
+                else:
+                    fresh = list(candidates.filter(jobs))
+                for jhash, job in fresh:
+                    posting.post(jhash, job)
+            elapsed = time.perf_counter() - started
+            if not label.startswith("before") and fuzzy:
+                # every fingerprinted candidate was either suppressed or posted
+                counts["fingerprints"] = posting.attempts + candidates.near_duplicates
+            print(f"  {label:<28}: {posting.attempts:4d} classify/logo/post passes, "
+                  f"{counts['fingerprints']:5d} fingerprints, {elapsed * 1000:6.1f} ms")
+        if fuzzy:
+            saved = candidates.fingerprints_saved
+        else:
+            saved = candidates.enrichments_saved
+        print(f"  counters: {candidates.repeats} repeats dropped, {saved} "
+              f"{'fingerprint checks' if fuzzy else 'enrichment passes'} saved")
+    return True
+
+
+# -------------------------
+# HTTP cache
+# -------------------------
+def _feed_server():
+    """Local stand-in feed host: ETag per feed, 304 on a matching If-None-Match, /broken cut off mid-body."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    feeds = {"versions": {}, "hits": [], "not_modified": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = self.path.strip("/")
+            feeds["hits"].append(name)
+            version = feeds["versions"].get(name, 1)
+            etag = f'"{name}-{version}"'
+            if self.headers.get("If-None-Match") == etag:
+                feeds["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = json.dumps({"feed": name, "version": version, "jobs": ["x" * 100] * 1000}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body) * (2 if name == "broken" else 1)))
+            self.end_headers()
+            self.wfile.write(body)  # /broken promises twice as much and closes early
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, feeds
+
+
+def bench_http_cache():
+    header("HTTP CACHE: conditional-GET cache against a local stand-in server")
+    import tempfile
+    server, feeds = _feed_server()
+    base = f"http://127.0.0.1:{server.server_port}"
+    cache = job_scraper.HTTP_CACHE
+    checks = []
+
+    def get(name):
+        started = time.perf_counter()
+        body = job_scraper.http_request("GET", f"{base}/{name}").json()
+        return body, time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        cache.configure(directory, 300_000, {"127.0.0.1": 3600})
+        try:
+            body, network = get("a")
+            checks.append(("first GET goes to the server and is stored", feeds["hits"] == ["a"] and cache.stored == 1))
+            body, fresh = get("a")
+            checks.append(("fresh entry served from disk, no request", feeds["hits"] == ["a"] and body["feed"] == "a"))
+            cache.host_ttls["127.0.0.1"] = 0
+            body, revalidated = get("a")
+            checks.append(("stale entry revalidated: 304 served from disk",
+                           feeds["not_modified"] == 1 and cache.revalidated == 1 and body["version"] == 1))
+            feeds["versions"]["a"] = 2
+            body, _ = get("a")
+            checks.append(("changed feed (new ETag) replaces the entry", body["version"] == 2 and cache.stored == 2))
+            for name in ("b", "c", "d"):
+                get(name)
+            on_disk = sum(p.stat().st_size for p in directory.glob("*.body"))
+            checks.append(("least recently used entries evicted under max_bytes",
+                           on_disk <= cache.max_bytes and cache.lookup(f"{base}/a") is None
+                           and cache.lookup(f"{base}/d") is not None))
+            try:
+                get("broken")
+                cut_off = False
+            except requests.RequestException:
+                cut_off = True
+            checks.append(("body cut off mid-stream: not cached, no temp file left",
+                           cut_off and cache.lookup(f"{base}/broken") is None and not list(directory.glob("*.tmp"))))
+            cache.host_ttls["127.0.0.1"] = 3600
+            get("e")
+            meta = cache.lookup(f"{base}/e")
+            cache._paths(meta["key"])[1].unlink()
+            checks.append(("body evicted between lookup and open: a miss, not an error",
+                           cache.open_response(meta, f"{base}/e") is None))
+            cache.max_bytes = 50_000
+            try:
+                body, _ = get("f")
+                oversized = body["feed"] == "f"
+            except OSError:
+                oversized = False
+            checks.append(("feed larger than max_bytes still served while it is evicted", oversized))
+        finally:
+            server.shutdown()
+            cache.directory = None
+            cache.host_ttls = {}
+    for label, ok in checks:
+        print(f"  [{'ok' if ok else 'FAIL'}] {label}")
+    print(f"  network GET {network * 1000:.1f} ms, fresh hit {fresh * 1000:.1f} ms, 304 revalidation {revalidated * 1000:.1f} ms")
+    return all(ok for _, ok in checks)
+
+
+# -------------------------
+# Logo processing
+# -------------------------
+def _synthetic_logos(seed=24):
+    """Clearbit-like small PNGs, large PNG/JPEG uploads, and repeats of the same bytes under other domains."""
+    from PIL import Image, ImageDraw
+    rng = random.Random(seed)
+    logos = []
+    for i in range(40):
+        large = i % 2 == 0
+        side = rng.choice([900, 1400, 2000]) if large else 128
+        img = Image.new("RGB", (side, side), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        draw = ImageDraw.Draw(img)
+        for _ in range(60):
+            x, y = rng.randrange(side), rng.randrange(side)
+            draw.ellipse((x, y, x + side // 6, y + side // 6), fill=(rng.randrange(256), rng.randrange(256), 90))
+        out = io.BytesIO()
+        img.save(out, format="JPEG" if large and i % 4 == 0 else "PNG")
+        logos.append(out.getvalue())
+    return logos + logos[:10]
+
+
+def _legacy_logo(data):
+    """attach_logo's image step before the logo stage: thumbnail and re-save in the source format."""
+    from PIL import Image
+    img = Image.open(io.BytesIO(data))
+    img.thumbnail((600, 600))
+    out = io.BytesIO()
+    img.save(out, format=img.format or "PNG")
+    return out.getvalue()
+
+
+def _run_with_ticker(func):
+    """Run func() while a thread wakes every 1 ms, as the posting threads wait on sockets; (seconds, worst lag)."""
+    import threading
+    stop = threading.Event()
+    worst = [0.0]
+
+    def ticker():
+        while not stop.is_set():
+            started = time.perf_counter()
+            time.sleep(0.001)
+            worst[0] = max(worst[0], time.perf_counter() - started - 0.001)
+
+    thread = threading.Thread(target=ticker)
+    thread.start()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    thread.join()
+    return elapsed, worst[0]
+
+
+def bench_logos():
+    header("LOGOS: inline thumbnail/re-save vs the logo stage (threads / process pool)")
+    from concurrent.futures import ThreadPoolExecutor
+    logos = _synthetic_logos()
+    digests = [hashlib.sha1(data).hexdigest() for data in logos]
+    print(f"{len(logos)} logos ({len(set(digests))} distinct, {sum(map(len, logos)) / 2**20:.1f} MB), "
+          f"4 posting threads; WebP available: {job_scraper.WEBP_SUPPORTED}")
+    out_bytes = {}
+
+    def legacy():
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            out_bytes["legacy"] = sum(len(b) for b in pool.map(_legacy_logo, logos))
+
+    rows = [("inline (before)", legacy, "legacy")]
+    for processes in (0, 2):
+        def staged(processes=processes):
+            processor = job_scraper.LogoProcessor({"processes": processes})
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(processor.process, logos, digests))
+            processor.close()
+            out_bytes[processes] = sum(len(r[0]) for r in results)
+        rows.append((f"stage, {processes or 'no'} processes", staged, processes))
+    for label, func, key in rows:
+        elapsed, lag = _run_with_ticker(func)
+        print(f"  {label:<22}: {elapsed * 1000:6.0f} ms, worst 1 ms-timer lag {lag * 1000:5.1f} ms, "
+              f"{out_bytes[key] / 1024:6.0f} KB to upload")
+    return True
+
+
+# -------------------------
+# Incremental fetching
+# -------------------------
+def bench_incremental():
+    header("INCREMENTAL: full board read vs reading down to the high-water mark")
+    body = _remoteok_board(3000)
+    since = BOARD_NEWEST - 600 * 150  # last run saw everything but the newest ~150 postings
+    print("Synthetic RemoteOK board: 3000 jobs, newest first; 150 posted since the last run")
+    original = job_scraper.http_request
+    job_scraper.http_request = lambda method, url, **kwargs: _fake_response(body)
+    try:
+        for label, query in (("query matching often", "python"), ("query matching nothing", "cobol")):
+            results = {}
+            for mode, mark in (("full read", None), ("since mark", since)):
+                def run():
+                    job_scraper.FEED_CACHE.clear()
+                    results[mode] = (job_scraper.query_remoteok(query, 80, since=mark),
+                                     job_scraper.FEED_CACHE.get("remoteok", lambda: None).parsed)
+                results[mode + " time"] = timed(run, repeat=3)
+            print(f"\n{label}")
+            for mode in ("full read", "since mark"):
+                jobs, parsed = results[mode]
+                print(f"  {mode:<10}: {parsed:5d} items parsed, {len(jobs):3d} candidates, "
+                      f"{results[mode + ' time'] * 1000:6.1f} ms")
+    finally:
+        job_scraper.http_request = original
+        job_scraper.FEED_CACHE.clear()
+    return True
+
+
+# -------------------------
+# Cross-source duplicates
+# -------------------------
+ROLES = ["Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer", "Product Designer",
+         "Machine Learning Engineer", "QA Engineer", "Mobile Developer", "Site Reliability Engineer",
+         "Data Engineer", "Security Engineer", "Engineering Manager", "Full Stack Developer", "Android Developer"]
+CITIES = ["Berlin", "London", "Lagos", "Nairobi", "Toronto", "Austin", "Sydney", "Warsaw", "Lisbon", "Bangalore"]
+WORDS = ("build ship scale design own maintain improve services apis pipelines models dashboards systems customers "
+         "payments search growth platform infrastructure reliability latency testing mentoring roadmap product data "
+         "cloud kubernetes python golang react typescript sql analytics experiments security compliance mobile").split()
+
+
+def _sentence(rng, n):
+    return " ".join(rng.choice(WORDS + FILLER) for _ in range(n)) + "."
+
+
+def _perturb(rng, text, rate):
+    """Drop or replace about `rate` of the words, as another board's copy of a posting would."""
+    out = []
+    for word in text.split():
+        r = rng.random()
+        if r < rate / 2:
+            continue
+        out.append(rng.choice(WORDS) if r < rate else word)
+    return " ".join(out)
+
+
+def near_duplicate_fixtures(n_jobs=1500, seed=19):
+    """
+    Labeled cross-source fixture set: stored jobs, plus probes that are the
+    same job reposted elsewhere (positives) or a different job that looks
+    alike (negatives).
+
+    Companies post several roles sharing an about-us and benefits boilerplate;
+    reposts change title noise, company suffix, location wording, HTML, and
+    5-10% of the description words.
+    """
+    rng = random.Random(seed)
+    companies = [f"{rng.choice(['Acme', 'Globex', 'Initech', 'Hooli', 'Vandelay', 'Stark'])} "
+                 f"{rng.choice(['Labs', 'Systems', 'Health', 'Pay', 'Cloud', 'AI'])} {i}" for i in range(n_jobs // 4)]
+    boilerplate = {c: (_sentence(rng, 40), _sentence(rng, 25)) for c in companies}
+    stored = []
+    for i in range(n_jobs):
+        company = rng.choice(companies)
+        about, benefits = boilerplate[company]
+        role = rng.choice(ROLES)
+        stored.append({"title": f"{rng.choice(['', 'Senior ', 'Lead ', 'Junior '])}{role}", "company": company,
+                       "location": rng.choice(CITIES + ["Worldwide", "Remote"]),
+                       "description": f"<p>{about}</p><p>{' '.join(_sentence(rng, 20) for _ in range(5))}</p>"
+                                      f"<ul><li>{benefits}</li></ul>"})
+    positives, negatives = [], []
+    for job in stored[:n_jobs // 2]:
+        strip_tags = job["description"].replace("<p>", " ").replace("</p>", " ")
+        location = job["location"] if rng.random() < 0.5 else rng.choice(["", "Remote", "Anywhere", job["location"]])
+        title = job["title"] + rng.choice(["", " (Remote)", " - Remote", " (m/f/d)"])
+        if rng.random() < 0.3:
+            title = title.upper()
+        description = "" if rng.random() < 0.15 else f"<div>{_perturb(rng, strip_tags, rng.uniform(0.05, 0.10))}</div>"
+        positives.append({"title": title, "company": job["company"] + rng.choice(["", " Inc.", ", Inc", " GmbH", " Ltd"]),
+                          "location": location, "description": description})
+    # a look-alike must not collide with any stored posting's title and company
+    taken = {(job["company"], job["title"]) for job in stored}
+    for job in stored[n_jobs // 2:]:
+        about, benefits = boilerplate[job["company"]]
+        kind = rng.random()
+        if kind < 0.4:  # another role at the same company: same boilerplate, different body
+            roles = [r for r in ROLES if (job["company"], r) not in taken]
+            if not roles:
+                continue
+            other = rng.choice(roles)
+            negatives.append({"title": other, "company": job["company"], "location": job["location"],
+                              "description": f"<p>{about}</p><p>{' '.join(_sentence(rng, 20) for _ in range(5))}</p>"
+                                             f"<ul><li>{benefits}</li></ul>"})
+        elif kind < 0.7:  # the same title at another company
+            negatives.append({"title": job["title"], "company": rng.choice(companies) + " X",
+                              "location": job["location"], "description": _sentence(rng, 100)})
+        elif not any(j["company"] == job["company"] and j["title"] == job["title"]
+                     and j["location"] in ("Worldwide", "Remote") for j in stored):
+            # the same company and title hiring in a different city, with its own description
+            negatives.append({"title": job["title"], "company": job["company"],
+                              "location": rng.choice([c for c in CITIES if c != job["location"]]),
+                              "description": f"<p>{about}</p><p>{' '.join(_sentence(rng, 20) for _ in range(5))}</p>"})
+    # the HTML scrapers and legacy entries often carry no company: the same title and city
+    # from two unknown employers is not evidence of the same job
+    for _ in range(n_jobs // 20):
+        title, city = rng.choice(stored)["title"], rng.choice(CITIES)
+        stored.append({"title": title, "company": rng.choice(["", None]), "location": city,
+                       "description": _sentence(rng, 100)})
+        negatives.append({"title": title, "company": "", "location": rng.choice([city, ""]),
+                          "description": _sentence(rng, 100)})
+    return stored, positives, negatives
+
+
+def _synthetic_dedup_entries(n, rng):
+    entries = []
+    for i in range(n):
+        sig = tuple(rng.getrandbits(32) for _ in range(job_scraper.MINHASH_PERMS))
+        entries.append({"hash": hashlib.sha1(str(i).encode()).hexdigest(), "title": f"{rng.choice(ROLES)} {i % 97}",
+                        "company": f"Company {i % 5000}", "location": rng.choice(CITIES), "url": f"https://x/{i}",
+                        "first_seen": 0, "mh": job_scraper.encode_signature(sig)})
+    return entries
+
+
+def bench_near_duplicates():
+    header("NEAR DUPLICATES: cross-source detection quality and index timing")
+    stored, positives, negatives = near_duplicate_fixtures()
+    index = job_scraper.NearDuplicateIndex()
+    for job in stored:
+        index.add(job_scraper.fingerprint_job(job))
+    tp = sum(index.find(job_scraper.fingerprint_job(j)) is not None for j in positives)
+    fp = sum(index.find(job_scraper.fingerprint_job(j)) is not None for j in negatives)
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / len(positives)
+    print(f"Fixture set: {len(stored)} stored jobs, {len(positives)} reposts, {len(negatives)} look-alikes")
+    print(f"  precision {precision:.3f}  recall {recall:.3f}  (exact-hash dedup: recall 0.000)")
+
+    rng = random.Random(100)
+    entries = _synthetic_dedup_entries(100_000, rng)
+    started = time.perf_counter()
+    dedup = DedupIndex(entries)
+    load = time.perf_counter() - started
+    probes = [job_scraper.fingerprint_job(j) for j in positives[:200] + negatives[:200]]
+    lookup = timed(lambda: [dedup.find_near_duplicate(p) for p in probes], repeat=3)
+    fingerprint = timed(lambda: [job_scraper.fingerprint_job(j) for j in positives[:200]], repeat=3)
+    print("\n100,000 stored entries with MinHash signatures")
+    print(f"  index build (DedupIndex load): {load:.2f} s")
+    print(f"  lookup:      {lookup / len(probes) * 1e6:7.1f} us/candidate")
+    print(f"  fingerprint: {fingerprint / 200 * 1e6:7.1f} us/candidate (normalize + MinHash)")
+    return precision >= 0.95 and recall >= 0.9
+
+
+# -------------------------
+# End-to-end replay
+# -------------------------
+STAND_IN_LATENCY = 0.02  # seconds per stand-in response, recorded as the fixture's elapsed time
+STAND_IN_ROLES = ["software engineer", "backend engineer", "frontend developer", "python developer",
+                  "data scientist", "devops engineer", "full stack developer", "cloud engineer",
+                  "mobile developer", "machine learning engineer", "react developer", "QA engineer"]
+STAND_IN_HTML = {"weworkremotely.com": "weworkremotely.html", "www.indeed.com": "indeed.html",
+                 "www.linkedin.com": "linkedin.html"}
+
+
+@functools.lru_cache(maxsize=None)
+def _stand_in_catalog(host, n):
+    """A host's job board: n jobs, newest first, one every 30 minutes before BOARD_NEWEST."""
+    rng = random.Random(host)
+    jobs = []
+    for i in range(n):
+        role = rng.choice(STAND_IN_ROLES)
+        jobs.append({"id": f"{host.split('.')[-2]}-{i}", "title": f"{rng.choice(['Senior', 'Junior', 'Lead', ''])} {role}".strip(),
+                     "company": f"Company {rng.randrange(80)}", "location": rng.choice(["Remote", "London", "Berlin", "New York"]),
+                     "description": " ".join(rng.choice(FILLER) for _ in range(300)) + f" {role}",
+                     "when": BOARD_NEWEST - 1800 * i, "role": role})
+    return jobs
+
+
+@functools.lru_cache(maxsize=None)
+def _stand_in_logos():
+    return _synthetic_logos()
+
+
+def _stand_in_body(host, path, params):
+    """JSON or HTML body a source, Clearbit or WordPress would answer with; None for a 404."""
+    params = params or {}
+    query = str(params.get("search") or params.get("tag") or params.get("q") or params.get("what")
+                or params.get("keywords") or "").lower()
+
+    def search(n):
+        # a slice of the host's catalog for the query, overlapping with other locales' searches
+        rng = random.Random(f"{host} {query}")
+        matches = [job for job in _stand_in_catalog(host, 400) if not query or job["role"].lower() in query
+                   or query in job["role"].lower()] or _stand_in_catalog(host, 400)
+        return sorted(rng.sample(matches, min(n, len(matches))), key=lambda job: -job["when"])
+
+    iso = lambda job: datetime.fromtimestamp(job["when"], timezone.utc).isoformat()
+    if host == "remotive.com":
+        return {"jobs": [{"id": j["id"], "title": j["title"], "company_name": j["company"], "url": f"https://{host}/{j['id']}",
+                          "candidate_required_location": j["location"], "description": j["description"],
+                          "publication_date": iso(j)} for j in search(20)]}
+    if host == "remoteok.com":
+        return [{"legal": "API terms of service"}] + [
+            {"id": j["id"], "position": j["title"], "company": j["company"], "tags": [j["role"]], "epoch": j["when"],
+             "location": j["location"], "description": j["description"], "url": f"https://{host}/{j['id']}"}
+            for j in _stand_in_catalog(host, 300)]
+    if host == "arbeitnow.com":
+        return {"data": [{"slug": j["id"], "title": j["title"], "company_name": j["company"], "location": j["location"],
+                          "description": j["description"], "url": f"https://{host}/{j['id']}", "created_at": j["when"]}
+                         for j in _stand_in_catalog(host, 200)]}
+    if host == "jobicy.com":
+        return {"jobs": [{"id": j["id"], "jobTitle": j["title"], "companyName": j["company"], "jobGeo": j["location"],
+                          "jobDescription": j["description"], "url": f"https://{host}/{j['id']}", "pubDate": iso(j)}
+                         for j in search(20)]}
+    if host == "himalayas.app":
+        return {"jobs": [{"id": j["id"], "slug": j["id"], "title": j["title"], "companyName": j["company"],
+                          "locationRestrictions": j["location"], "description": j["description"], "pubDate": j["when"]}
+                         for j in search(20)]}
+    if host == "api.adzuna.com":
+        return {"results": [{"id": j["id"], "title": j["title"], "company": {"display_name": j["company"]},
+                             "location": {"display_name": j["location"]}, "description": j["description"],
+                             "redirect_url": f"https://{host}/{j['id']}", "created": iso(j)} for j in search(15)]}
+    if host == "www.reed.co.uk":
+        return {"results": [{"jobId": j["id"], "jobTitle": j["title"], "employerName": j["company"],
+                             "locationName": j["location"], "jobDescription": j["description"],
+                             "jobUrl": f"https://{host}/{j['id']}",
+                             "date": datetime.fromtimestamp(j["when"], timezone.utc).strftime("%d/%m/%Y")}
+                            for j in search(15)]}
+    if host in STAND_IN_HTML:
+        return (Path(__file__).parent / "fixtures" / "html" / STAND_IN_HTML[host]).read_bytes()
+    if host == "logo.clearbit.com":
+        digest = hashlib.sha1(path.encode()).digest()
+        if digest[0] % 3 == 0:
+            return None  # no logo for this company
+        return _stand_in_logos()[digest[1] % 40]
+    if host == "wp.example":
+        if path.endswith("/wp-json/"):
+            return {"routes": {"/wp/v2/posts": {}, "/wp/v2/media": {}}}
+        if path.endswith(("/wp/v2/posts", "/wp/v2/media")):
+            return {"id": random.randrange(1, 10**6)}
+    return None
+
+
+def _stand_in_request(session, method, url, params=None, **kwargs):
+    """requests.Session.request for the record run: answers every host from _stand_in_body."""
+    from datetime import timedelta
+    parts = urlparse(url)
+    body = _stand_in_body(parts.hostname, parts.path, params)
+    time.sleep(STAND_IN_LATENCY)
+    resp = requests.Response()
+    resp.url = url
+    resp.elapsed = timedelta(seconds=STAND_IN_LATENCY)
+    if body is None:
+        resp.status_code, resp.reason, body = 404, "Not Found", b""
+    else:
+        resp.status_code = 201 if method.upper() == "POST" else 200
+        resp.reason = "OK"
+    if isinstance(body, bytes):
+        ctype = "image/png" if body[:4] == b"\x89PNG" else "text/html; charset=utf-8"
+    else:
+        body, ctype = json.dumps(body).encode(), "application/json; charset=utf-8"
+    resp.headers["Content-Type"] = ctype
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    resp.raw = io.BytesIO(body)
+    return resp
+
+
+def _run_main_child(workdir, latency, out):
+    """Run job_scraper.main() in this fresh process on a throwaway state/dedup/cache and report its cost."""
+    import logging
+    import resource
+    import yaml
+    workdir = Path(workdir)
+    config = yaml.safe_load(job_scraper.CONFIG_PATH.read_text(encoding="utf-8"))
+    # replayed hosts need no politeness pacing: no host pauses or per-minute call windows
+    for cont in config.get("continents", []):
+        cont["pause_seconds"] = 0
+    for src in config.get("sources", []):
+        (src.get("budget") or {}).pop("per_minute", None)
+    config.setdefault("http", {})["replay_latency"] = latency
+    config.setdefault("http_cache", {})["dir"] = str(workdir / "http_cache")
+    config.setdefault("dedup", {})["path"] = str(workdir / "posted_jobs.jsonl")
+    (workdir / "config.yaml").write_text(yaml.safe_dump(config), encoding="utf-8")
+    job_scraper.CONFIG_PATH = workdir / "config.yaml"
+    job_scraper.DEDUP_PATH = workdir / "posted_jobs.json"
+    job_scraper.STATE_PATH = workdir / "scraper_state.json"
+    timers = []
+
+    class KeptTimer(job_scraper.StageTimer):
+        def __init__(self):
+            super().__init__()
+            timers.append(self)
+
+    job_scraper.StageTimer = KeptTimer
+    if job_scraper.HTTP_REPLAY_ENV == "record":
+        requests.Session.request = _stand_in_request
+    logging.getLogger("techjobs360").setLevel(logging.WARNING)
+
+    started, cpu_started = time.perf_counter(), time.process_time()
+    job_scraper.main()
+    wall, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    stages = {"fetch": {"cpu": sum(st["cpu"] for st in job_scraper.SOURCE_STATS.totals().values()),
+                        "wall": sum(st["total"] for st in job_scraper.SOURCE_STATS.totals().values())}}
+    stages.update(timers[0].totals() if timers else {})
+    posted = job_scraper.DedupIndex.load(job_scraper.make_dedup_backend(config["dedup"]))
+    out.put({"wall": wall, "cpu": cpu, "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+             "requests": job_scraper.HTTP_REPLAY.requests, "bytes": job_scraper.HTTP_REPLAY.bytes,
+             "misses": job_scraper.HTTP_REPLAY.misses, "posted": len(posted), "stages": stages})
+
+
+def _run_main(mode, fixtures, latency=0.0, own_credentials=False):
+    import multiprocessing
+    import os
+    import tempfile
+    env = {"HTTP_REPLAY": mode, "HTTP_FIXTURES_DIR": str(fixtures), "AUTO_ROTATE": "false"}
+    for name, value in (("WP_URL", "https://wp.example"), ("WP_USERNAME", "bench"), ("WP_APP_PASSWORD", "bench"),
+                        ("ADZUNA_APP_ID", "bench"), ("ADZUNA_APP_KEY", "bench"), ("REED_API_KEY", "bench")):
+        # a real recording is keyed by the WordPress URL it was made with
+        env[name] = os.environ.get(name, value) if own_credentials else value
+    saved = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        out = ctx.Queue()
+        with tempfile.TemporaryDirectory() as workdir:
+            child = ctx.Process(target=_run_main_child, args=(workdir, latency, out))
+            child.start()
+            report = out.get()
+            child.join()
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    return report
+
+
+def bench_replay():
+    header("REPLAY: full main() run served from recorded HTTP fixtures")
+    import os
+    import tempfile
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = os.environ.get("HTTP_FIXTURES_DIR")
+        if fixtures:
+            print(f"Replaying fixtures recorded in {fixtures}")
+        else:
+            fixtures = Path(tmp) / "http"
+            print(f"Recording from a stand-in network (every host answers after {STAND_IN_LATENCY * 1000:.0f} ms); "
+                  f"set HTTP_FIXTURES_DIR to replay a real HTTP_REPLAY=record run instead")
+            runs.append(("record (stand-in)", _run_main("record", fixtures)))
+        own = bool(os.environ.get("HTTP_FIXTURES_DIR"))
+        runs.append(("replay", _run_main("replay", fixtures, own_credentials=own)))
+        runs.append(("replay, recorded latency", _run_main("replay", fixtures, latency=1.0, own_credentials=own)))
+    print(f"{'run':<26} {'wall':>7} {'requests':>9} {'MB':>6} {'cpu':>7} {'peak RSS':>9} {'posted':>7}")
+    for label, r in runs:
+        print(f"{label:<26} {r['wall']:>6.1f}s {r['requests']:>9} {r['bytes'] / 1e6:>6.1f} {r['cpu']:>6.1f}s "
+              f"{r['peak_mb']:>7.0f}MB {r['posted']:>7}")
+    # calls finish in a different order each run, so which of two look-alike jobs is posted
+    # (and so the request and post counts) can differ by a few
+    replay = runs[-2][1]
+    print("CPU per stage (replay; logo worker processes not included): "
+          + ", ".join(f"{stage} {st['cpu']:.2f}s" for stage, st in replay["stages"].items()))
+    if replay["misses"]:
+        print(f"  {replay['misses']} requests had no recorded response")
+    return replay["misses"] == 0 and replay["posted"] > 0
+
+
+BENCHMARKS = {
+    "dedup": bench_dedup,
+    "classify": bench_classify,
+    "feeds": bench_feeds,
+    "html": bench_html,
+    "http_cache": bench_http_cache,
+    "job_records": bench_job_records,
+    "streaming": bench_streaming,
+    "seen_set": bench_seen_set,
+    "logos": bench_logos,
+    "incremental": bench_incremental,
+    "near_duplicates": bench_near_duplicates,
+    "replay": bench_replay,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="benchmarks to run: %s (default: all)" % ", ".join(BENCHMARKS))
+    args = parser.parse_args()
+    unknown = [n for n in args.names if n not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmark(s): %s" % ", ".join(unknown))
+    ok = True
+    for name in args.names or BENCHMARKS:
+        ok = BENCHMARKS[name]() is not False and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())